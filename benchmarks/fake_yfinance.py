@@ -0,0 +1,50 @@
+"""Offline stand-in for ``yfinance`` used by the benchmark harness.
+
+Only ``download`` is provided, which is all the stock page uses. Prices come
+from ``benchmarks/fixtures/<TICKER>.csv`` when such a file exists (columns
+``Date`` and ``Close``); otherwise a deterministic random walk is generated
+per ticker, so runs are reproducible and never touch the network.
+"""
+import sys
+import types
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+
+def _load_fixture(ticker):
+    path = FIXTURE_DIR / f"{ticker}.csv"
+    if not path.exists():
+        return None
+    return pd.read_csv(path, index_col="Date", parse_dates=True)[["Close"]]
+
+
+def _synthetic_prices(ticker, start, end):
+    index = pd.bdate_range(start=pd.Timestamp(start).normalize(), end=pd.Timestamp(end).normalize())
+    rng = np.random.default_rng(zlib.crc32(ticker.encode("utf-8")))
+    returns = rng.normal(loc=0.0004, scale=0.02, size=len(index))
+    close = 100.0 * np.exp(np.cumsum(returns))
+    return pd.DataFrame({"Close": close}, index=index)
+
+
+def download(tickers, start=None, end=None, **kwargs):
+    data = _load_fixture(tickers)
+    if data is None:
+        return _synthetic_prices(tickers, start, end)
+    if start is not None:
+        data = data[data.index >= pd.Timestamp(start)]
+    if end is not None:
+        data = data[data.index <= pd.Timestamp(end)]
+    return data
+
+
+def install():
+    """Register this module as ``yfinance`` so pages import it instead."""
+    module = types.ModuleType("yfinance")
+    module.download = download
+    sys.modules["yfinance"] = module
+    return module
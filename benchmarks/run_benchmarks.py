@@ -0,0 +1,349 @@
+"""Headless benchmark suite for the pages under ``pages/``.
+
+Each page is loaded with Streamlit's ``AppTest`` and driven through a scripted
+interaction sequence. For every rerun the wall time, peak Python memory
+(``tracemalloc``) and the emitted payload (element protos plus media files
+such as ``st.image`` PNGs) are recorded. ``yfinance`` is replaced with
+``fake_yfinance`` so nothing hits the network.
+
+Every page runs in its own fresh interpreter (``--worker``), so each page
+pays the same cold-start import cost no matter which pages run or in what
+order. Inside the worker the scenario runs twice with ``st.cache_data``
+cleared before each pass: once untraced for wall time and payload, then once
+under ``tracemalloc`` for peak memory, so tracing overhead never shows up in
+the timings.
+
+The cold ``initial`` rerun is reported on its own. ``cold_start_s`` is its
+full wall time and ``first_element_s`` is the time until the page emits its
+first element (usually the title), which is the first-paint number the lazy
+imports in ``shared.startup`` aim to lower. The step reruns after it are
+summed into ``steady_wall_time_s``.
+
+Usage::
+
+    python benchmarks/run_benchmarks.py --output benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json
+
+With ``--compare`` the new results are diffed against an earlier baseline and
+the script exits with status 1 when a steady-state metric (step wall time,
+peak memory, payload bytes) grows by more than ``--threshold`` (default
+20%). Cold-start numbers are printed alongside but never fail the run,
+because they depend mostly on disk and import caches.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import fake_yfinance
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PAGES_DIR = REPO_ROOT / "pages"
+
+# `streamlit run main.py`와 같이 페이지에서 shared 패키지를 불러올 수 있게 합니다.
+sys.path.insert(0, str(REPO_ROOT))
+# 백그라운드 warm-up 스레드의 import가 먼저 실행되는 페이지의 측정값에 섞이지 않도록 끕니다.
+os.environ["WARM_START"] = "0"
+
+fake_yfinance.install()
+
+import numpy as np  # noqa: E402
+import streamlit  # noqa: E402
+from streamlit.delta_generator import DeltaGenerator  # noqa: E402
+from streamlit.runtime.media_file_manager import MediaFileManager  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+
+# --- 위젯 찾기 ---
+def widget(at, kind, label):
+    for element in getattr(at, kind):
+        if element.label == label:
+            return element
+    raise LookupError(f"{kind} '{label}' not found")
+
+
+# --- 페이지별 시나리오 ---
+# 각 단계는 (이름, AppTest를 받아 위젯 값을 바꾸는 함수) 입니다.
+
+# 주식 페이지의 기업 목록 (pages/00_주식데이터시각화.py의 top_10_tickers와 같은 순서)
+STOCK_COMPANIES = [
+    "Apple", "Microsoft", "Alphabet (Google)", "Amazon", "NVIDIA",
+    "Meta Platforms", "Tesla", "Berkshire Hathaway", "Eli Lilly and Company", "TSMC",
+]
+
+
+def stock_steps():
+    label = "조회할 기업을 선택하세요:"
+    return [
+        ("select_one", lambda at: widget(at, "multiselect", label).set_value(STOCK_COMPANIES[:1])),
+        ("select_five", lambda at: widget(at, "multiselect", label).set_value(STOCK_COMPANIES[:5])),
+        ("select_all", lambda at: widget(at, "multiselect", label).set_value(STOCK_COMPANIES)),
+    ]
+
+
+def binomial_steps():
+    steps = []
+    for n in (10, 50, 100, 250, 500):
+        steps.append((f"n={n}", lambda at, n=n: widget(at, "slider", "시행 횟수 (n)").set_value(n)))
+    for p in (0.1, 0.3, 0.7, 0.9):
+        steps.append((f"p={p}", lambda at, p=p: widget(at, "slider", "성공 확률 (p)").set_value(p)))
+    return steps
+
+
+def function_steps():
+    steps = []
+    for label, value in (("k 값", 2.0), ("p 값 (수직 점근선 관련)", 1.5), ("q 값 (수평 점근선 관련)", -2.0)):
+        steps.append((f"rational {label}={value}", lambda at, label=label, value=value: widget(at, "number_input", label).set_value(value)))
+    steps.append(("irrational", lambda at: widget(at, "radio", "어떤 함수를 탐색하시겠어요?").set_value("무리함수 (Irrational Function)")))
+    for label, value in (("a 값", -2.0), ("b 값", 3.0), ("c 값", 1.0)):
+        steps.append((f"irrational {label}={value}", lambda at, label=label, value=value: widget(at, "number_input", label).set_value(value)))
+    steps.append(("irrational sign=-", lambda at: widget(at, "radio", "루트 앞 부호").set_value("-")))
+    return steps
+
+
+def tessellation_setup(at):
+    # 캔버스 컴포넌트는 AppTest에서 값을 돌려주지 않으므로 확정된 정사각형을 미리 넣어 둡니다.
+    half = 150 / 2
+    center_x, center_y = 700 / 2, 500 / 2
+    at.session_state["confirmed_polygon_vertices"] = np.array([
+        [center_x - half, center_y - half],
+        [center_x + half, center_y - half],
+        [center_x + half, center_y + half],
+        [center_x - half, center_y + half],
+    ])
+    at.session_state["canvas_drawn_objects"] = []
+    at.session_state["confirmed_geometry_hash"] = "benchmark-square"
+
+
+def tessellation_steps():
+    steps = []
+    # 행/열 슬라이더의 최댓값(10)까지 키워 갑니다.
+    for size in (1, 3, 5, 8, 10):
+        steps.append((f"{size}x{size}", lambda at, size=size: (
+            widget(at, "slider", "행 개수:").set_value(size),
+            widget(at, "slider", "열 개수:").set_value(size),
+        )))
+    steps.append(("rotate", lambda at: widget(at, "radio", "테셀레이션 변환 방식:").set_value("회전")))
+    steps.append(("reflect", lambda at: widget(at, "radio", "테셀레이션 변환 방식:").set_value("대칭")))
+    return steps
+
+
+# 파일 이름 앞의 번호로 시나리오를 찾습니다. 시나리오가 없는 페이지는 첫 실행만 측정합니다.
+SCENARIOS = {
+    "00": (None, stock_steps),
+    "01": (None, binomial_steps),
+    "02": (None, function_steps),
+    "03": (tessellation_setup, tessellation_steps),
+}
+
+
+# --- 측정 ---
+# AppTest는 실행이 끝나면 임시 런타임(과 미디어 저장소)을 버리므로,
+# 실행 중에 MediaFileManager.add로 등록되는 바이트를 직접 셉니다.
+# (다운로드 버튼 데이터는 클릭할 때만 전송되므로 제외합니다.)
+_media_bytes = [0]
+_original_media_add = MediaFileManager.add
+
+
+def _counting_media_add(self, path_or_data, mimetype, coordinates, file_name=None, is_for_static_download=False):
+    if isinstance(path_or_data, bytes) and not is_for_static_download:
+        _media_bytes[0] += len(path_or_data)
+    return _original_media_add(
+        self, path_or_data, mimetype, coordinates,
+        file_name=file_name, is_for_static_download=is_for_static_download,
+    )
+
+
+MediaFileManager.add = _counting_media_add
+
+# 첫 요소가 화면에 보내지는 시각을 재기 위해 DeltaGenerator._enqueue를 감쌉니다.
+# 공개 API에는 요소 전송 시점을 알려 주는 훅이 없어서 내부 메서드를 씁니다.
+_first_element_at = [None]
+_original_enqueue = DeltaGenerator._enqueue
+
+
+def _timing_enqueue(self, *args, **kwargs):
+    if _first_element_at[0] is None:
+        _first_element_at[0] = time.perf_counter()
+    return _original_enqueue(self, *args, **kwargs)
+
+
+DeltaGenerator._enqueue = _timing_enqueue
+
+
+def proto_bytes(node):
+    total = 0
+    proto = getattr(node, "proto", None)
+    if proto is not None:
+        total += proto.ByteSize()
+    for child in getattr(node, "children", {}).values():
+        total += proto_bytes(child)
+    return total
+
+
+def timed_run(at, step_name, timeout):
+    _media_bytes[0] = 0
+    _first_element_at[0] = None
+    start = time.perf_counter()
+    at.run(timeout=timeout)
+    wall_time = time.perf_counter() - start
+    first_element = _first_element_at[0] - start if _first_element_at[0] is not None else None
+
+    if at.exception:
+        raise RuntimeError(f"step '{step_name}' raised: {at.exception[0].message}")
+
+    return {
+        "step": step_name,
+        "wall_time_s": wall_time,
+        "first_element_s": first_element,
+        "payload_bytes": proto_bytes(at.main) + proto_bytes(at.sidebar) + _media_bytes[0],
+    }
+
+
+def traced_run(at, step_name, timeout):
+    tracemalloc.start()
+    try:
+        at.run(timeout=timeout)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    if at.exception:
+        raise RuntimeError(f"step '{step_name}' raised: {at.exception[0].message}")
+    return peak
+
+
+def run_scenario(page_path, timeout, run_step):
+    setup, steps_factory = SCENARIOS.get(page_path.name[:2], (None, list))
+    streamlit.cache_data.clear()
+    at = AppTest.from_file(str(page_path), default_timeout=timeout)
+    if setup is not None:
+        setup(at)
+
+    results = [run_step(at, "initial", timeout)]
+    for step_name, apply_step in steps_factory():
+        apply_step(at)
+        results.append(run_step(at, step_name, timeout))
+    return results
+
+
+def run_page(page_path, timeout):
+    """Measure one page. Meant to run inside a fresh ``--worker`` process."""
+    reruns = run_scenario(page_path, timeout, timed_run)
+    peaks = run_scenario(page_path, timeout, traced_run)
+    for rerun, peak in zip(reruns, peaks):
+        rerun["peak_memory_bytes"] = peak
+
+    return {
+        "page": page_path.name,
+        "reruns": reruns,
+        "cold_start_s": reruns[0]["wall_time_s"],
+        "first_element_s": reruns[0]["first_element_s"],
+        "steady_wall_time_s": sum(r["wall_time_s"] for r in reruns[1:]),
+        "max_peak_memory_bytes": max(r["peak_memory_bytes"] for r in reruns),
+        "total_payload_bytes": sum(r["payload_bytes"] for r in reruns),
+    }
+
+
+def run_page_in_subprocess(page_path, timeout):
+    proc = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--worker", page_path.name, "--timeout", str(timeout)],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{page_path.name} failed:\n{proc.stderr}")
+    # 페이지가 stdout에 무언가 출력할 수 있으므로 마지막 줄만 결과로 읽습니다.
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_all(page_filter, timeout):
+    results = {}
+    for page_path in sorted(PAGES_DIR.glob("*.py")):
+        if page_filter and not any(f in page_path.name for f in page_filter):
+            continue
+        print(f"running {page_path.name} ...", flush=True)
+        results[page_path.stem] = run_page_in_subprocess(page_path, timeout)
+    return {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "scenarios": results,
+    }
+
+
+# --- 기준선 비교 ---
+METRICS = ("steady_wall_time_s", "max_peak_memory_bytes", "total_payload_bytes")
+# 참고용으로만 출력하고 회귀 판정에는 쓰지 않는 값
+INFO_METRICS = ("cold_start_s", "first_element_s")
+
+
+def compare(baseline, current, threshold):
+    regressed = False
+    for name, result in current["scenarios"].items():
+        old = baseline["scenarios"].get(name)
+        if old is None:
+            print(f"{name}: no baseline")
+            continue
+        print(name)
+        for metric in METRICS:
+            before, after = old[metric], result[metric]
+            change = (after - before) / before if before else 0.0
+            flag = ""
+            if change > threshold:
+                flag = "  <-- regression"
+                regressed = True
+            print(f"  {metric:24s} {before:>14.4f} -> {after:>14.4f} ({change:+.1%}){flag}")
+        for metric in INFO_METRICS:
+            if old.get(metric) is not None and result.get(metric) is not None:
+                print(f"  {metric:24s} {old[metric]:>14.4f} -> {result[metric]:>14.4f} (info)")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, help="write results as a JSON baseline to this path")
+    parser.add_argument("--compare", type=Path, help="diff results against an earlier JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative increase reported as a regression")
+    parser.add_argument("--page", action="append", help="only run pages whose file name contains this text")
+    parser.add_argument("--timeout", type=float, default=60, help="per-rerun timeout in seconds")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_page(PAGES_DIR / args.worker, args.timeout), ensure_ascii=False))
+        return 0
+
+    current = run_all(args.page, args.timeout)
+
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"wrote {args.output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if compare(baseline, current, args.threshold):
+            return 1
+    elif not args.output:
+        print(json.dumps(current, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,23 @@
+import streamlit as st
 
+from shared import metrics
+from shared.startup import warm_up, import_report
+
+# 서버가 뜬 뒤 첫 세션에서 무거운 모듈을 백그라운드로 미리 불러옵니다.
+warm_up()
+metrics.start_rerun("home")
+
+st.title("수학 시각화 도구 모음")
+st.markdown("왼쪽 사이드바에서 페이지를 선택하세요.")
+
+with st.expander("모듈 로딩 시간"):
+    report = import_report()
+    if report:
+        st.table([
+            {"모듈": row["module"], "시간 (초)": f"{row['seconds']:.3f}", "불러온 곳": row["source"]}
+            for row in report
+        ])
+    else:
+        st.write("아직 불러온 모듈이 없습니다.")
+
+metrics.dev_panel()
@@ -1,11 +1,15 @@
 
 import streamlit as st
-import yfinance as yf
-import pandas as pd
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 
+from shared import metrics
+from shared.figures import plotly_chart
+from shared.startup import lazy_import, warm_up
+
 st.set_page_config(layout="wide")
+warm_up()
+metrics.start_rerun("stock")
 
 st.title("글로벌 시총 Top 10 기업 주가 변화 시각화 (최근 3년)")
 
@@ -40,7 +44,12 @@ if not selected_companies:
 else:
     st.subheader(f"선택된 기업들의 주가 변화 ({start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')})")
 
+    # 제목과 사이드바를 먼저 그린 뒤 무거운 모듈을 불러옵니다.
+    yf = lazy_import("yfinance")
+    pd = lazy_import("pandas")
+
     all_data = pd.DataFrame()
+    fetch_timer = metrics.section("fetch").start()
     for company_name in selected_companies:
         ticker = top_10_tickers[company_name]
         try:
@@ -58,11 +67,15 @@ else:
                 st.warning(f"'{company_name}' ({ticker})의 데이터를 가져올 수 없거나 데이터가 비어있습니다.")
         except Exception as e:
             st.error(f"'{company_name}' ({ticker})의 데이터를 가져오는 중 오류가 발생했습니다: {e}")
+    fetch_timer.stop()
 
     if not all_data.empty:
         # 각 기업의 초기 주가를 기준으로 정규화하여 변화율 시각화
+        compute_timer = metrics.section("compute").start()
         normalized_data = all_data / all_data.iloc[0] * 100
+        compute_timer.stop()
 
+        figure_timer = metrics.section("build-figure").start()
         fig = go.Figure()
 
         for col in normalized_data.columns:
@@ -75,10 +88,16 @@ else:
             hovermode="x unified",
             height=600
         )
-        st.plotly_chart(fig, use_container_width=True)
+        figure_timer.stop()
+
+        render_timer = metrics.section("render").start()
+        plotly_chart(fig, use_container_width=True)
 
         st.subheader("원시 주가 데이터 (종가)")
         st.dataframe(all_data)
+        render_timer.stop()
 
     else:
         st.info("선택된 기업들의 주가 데이터를 로드할 수 없습니다.")
+
+metrics.dev_panel()
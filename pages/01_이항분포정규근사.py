@@ -1,9 +1,14 @@
 import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
-from scipy.stats import binom, norm
+
+from shared import metrics
+from shared.figures import plotly_chart
+from shared.startup import lazy_import, warm_up
 
 st.set_page_config(layout="wide")
+warm_up()
+metrics.start_rerun("binomial")
 st.title("📊 이항분포의 정규근사 시각화")
 st.markdown("시행 횟수(`n`)와 성공 확률(`p`)을 조절하여 이항분포가 정규분포에 얼마나 가까워지는지 확인해보세요.")
 
@@ -12,7 +17,12 @@ st.sidebar.header("설정")
 n = st.sidebar.slider("시행 횟수 (n)", 1, 500, 30) # n 값 슬라이더 (1부터 500까지, 기본값 30)
 p = st.sidebar.slider("성공 확률 (p)", 0.01, 0.99, 0.50, 0.01) # p 값 슬라이더 (0.01부터 0.99까지, 기본값 0.50, 스텝 0.01)
 
+# 제목과 사이드바를 먼저 그린 뒤 무거운 모듈을 불러옵니다.
+stats = lazy_import("scipy.stats")
+binom, norm = stats.binom, stats.norm
+
 # --- 이항분포 계산 ---
+compute_timer = metrics.section("compute").start()
 # 가능한 성공 횟수 (0부터 n까지)
 k_values = np.arange(0, n + 1)
 # 이항분포의 각 성공 횟수에 대한 확률 계산
@@ -27,8 +37,10 @@ sigma = np.sqrt(n * p * (1 - p))
 x_values = np.linspace(mu - 4 * sigma, mu + 4 * sigma, 500)
 # 정규분포의 확률 밀도 함수(PDF) 계산
 normal_pdf = norm.pdf(x_values, loc=mu, scale=sigma)
+compute_timer.stop()
 
 # --- 시각화 ---
+figure_timer = metrics.section("build-figure").start()
 fig = go.Figure()
 
 # 1. 이항분포 막대 그래프 추가
@@ -60,8 +72,11 @@ fig.update_layout(
     height=600,
     showlegend=True
 )
+figure_timer.stop()
 
-st.plotly_chart(fig, use_container_width=True)
+render_timer = metrics.section("render").start()
+plotly_chart(fig, use_container_width=True)
+render_timer.stop()
 
 # --- 근사 조건 및 정보 표시 ---
 st.subheader("📊 계산 결과 및 근사 조건")
@@ -83,3 +98,5 @@ with col2:
 
 st.markdown("---")
 st.markdown("© 2025 이항분포 시각화 앱. Made for Math Class.")
+
+metrics.dev_panel()
@@ -2,7 +2,13 @@ import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
 
+from shared import metrics
+from shared.figures import plotly_chart
+from shared.startup import warm_up
+
 st.set_page_config(layout="wide")
+warm_up()
+metrics.start_rerun("functions")
 st.title("📈 유리함수 & 무리함수 그래프 탐색기")
 st.markdown("계수를 조절하여 함수의 그래프와 특징을 실시간으로 확인해보세요!")
 
@@ -24,6 +30,7 @@ if function_type == "유리함수 (Rational Function)":
     q = st.sidebar.number_input("q 값 (수평 점근선 관련)", value=0.0, step=0.1, format="%.1f")
 
     # 그래프 데이터 생성
+    compute_timer = metrics.section("compute").start()
     x = np.linspace(-10, 10, 400)
     
     # 점근선 처리: p 주변에서 그래프가 끊어지도록 nan 값 사용
@@ -32,8 +39,10 @@ if function_type == "유리함수 (Rational Function)":
     
     graph_x_segment2 = x[x > p + 0.01]
     graph_y_segment2 = k / (graph_x_segment2 - p) + q
+    compute_timer.stop()
 
     # Plotly 그래프 생성
+    figure_timer = metrics.section("build-figure").start()
     fig = go.Figure()
 
     # 유리함수 그래프 (두 부분으로 나눠서 그립니다)
@@ -95,7 +104,11 @@ if function_type == "유리함수 (Rational Function)":
         )
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    figure_timer.stop()
+
+    render_timer = metrics.section("render").start()
+    plotly_chart(fig, use_container_width=True)
+    render_timer.stop()
 
     # --- 학습 도구 부분: 내 생각은? (유리함수) ---
     st.subheader("💡 내 생각은?")
@@ -170,6 +183,7 @@ else: # function_type == "무리함수 (Irrational Function)"
     start_y = c
 
     # 그래프 데이터 생성
+    compute_timer = metrics.section("compute").start()
     if a > 0:
         x_range = np.linspace(start_x, start_x + 10, 400)
     else: # a < 0
@@ -182,8 +196,10 @@ else: # function_type == "무리함수 (Irrational Function)"
         y_range = -y_range
     
     y_range += c
+    compute_timer.stop()
 
     # Plotly 그래프 생성
+    figure_timer = metrics.section("build-figure").start()
     fig = go.Figure()
 
     # 무리함수 그래프
@@ -228,7 +244,11 @@ else: # function_type == "무리함수 (Irrational Function)"
         )
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    figure_timer.stop()
+
+    render_timer = metrics.section("render").start()
+    plotly_chart(fig, use_container_width=True)
+    render_timer.stop()
 
     # --- 학습 도구 부분: 내 생각은? (무리함수) ---
     st.subheader("💡 내 생각은?")
@@ -290,3 +310,5 @@ else: # function_type == "무리함수 (Irrational Function)"
     st.markdown("---")
 
 st.markdown("© 2025 함수 그래프 탐색기 앱. Made for Math Class.")
+
+metrics.dev_panel()
@@ -1,15 +1,19 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.patches import Polygon
 import math
+import json
+import hashlib
 from io import BytesIO
 
 # 필요한 라이브러리: pip install streamlit numpy matplotlib streamlit-drawable-canvas
-from streamlit_drawable_canvas import st_canvas
+# matplotlib과 streamlit_drawable_canvas는 사용하는 시점에 불러옵니다.
+from shared import metrics
+from shared.startup import lazy_import, warm_up
 
 # --- Streamlit 앱 기본 설정 ---
 st.set_page_config(layout="wide")
+warm_up()
+metrics.start_rerun("tessellation")
 st.title("✂️ 나만의 테셀레이션 만들기 (캔버스 버전)")
 st.write("캔버스에서 도형을 직접 변형하고 꾸민 후, 테셀레이션 패턴을 만들어 보세요!")
 
@@ -59,8 +63,8 @@ selected_shape_type = st.sidebar.selectbox("기본 정다각형 선택:", ["정
 selected_tile_size = st.sidebar.slider("캔버스 타일 기준 크기:", min_value=50, max_value=250, value=150, step=10, key="tile_size_select")
 
 # --- 캔버스에 초기 도형 그리기 위한 데이터 생성 및 캐싱 ---
-# `st.cache_data`를 사용하여 매번 재계산하지 않도록 최적화 (성능 향상)
-@st.cache_data(show_spinner=False)
+# `st.cache_data`를 사용하여 매번 재계산하지 않도록 최적화 (성능 향상, 적중률은 metrics에 기록)
+@metrics.cache_data(show_spinner=False)
 def get_cached_initial_drawing_data(current_shape_type, current_tile_size, c_width, c_height):
     verts = get_initial_drawable_polygon_vertices(current_shape_type, current_tile_size, c_width, c_height)
     
@@ -75,22 +79,54 @@ def get_cached_initial_drawing_data(current_shape_type, current_tile_size, c_wid
         }]
     }
 
-# --- 캔버스 초기화 로직 (사이드바 선택 변경 시 캔버스 초기화) ---
+# --- 캔버스 상태 관리 ---
+# 캔버스 key는 도형/크기를 바꿀 때만 바뀌는 리비전 번호로 고정합니다.
+# (그리기 모드를 바꿔도 캔버스가 다시 마운트되지 않아 변형한 도형이 유지됩니다.)
+# 기본 도형은 initial_drawing의 첫 번째 객체이므로 그 위치(id)를 기억해 두고 바로 찾습니다.
+TILE_OBJECT_ID = 0
+
+def find_tile_object(objects):
+    # 추적 중인 위치에 도형이 있으면 바로 반환하고, 없을 때만 뒤에서부터 찾습니다.
+    if len(objects) > TILE_OBJECT_ID and objects[TILE_OBJECT_ID].get("type") == "polygon":
+        return objects[TILE_OBJECT_ID]
+    for obj in reversed(objects):
+        if obj.get("type") == "polygon":
+            return obj
+    return None
+
+def get_drawn_lines(objects):
+    return [obj for obj in objects if obj.get("type") == "path" or obj.get("type") == "line"]
+
+def get_geometry_hash(polygon_object, drawn_lines):
+    # 도형의 기하 정보(꼭짓점, 위치, 크기, 회전)와 꾸민 선만 해시합니다.
+    # 해시가 같으면 도형 확정과 테셀레이션 계산을 다시 하지 않습니다.
+    geometry = {
+        key: polygon_object.get(key)
+        for key in ("points", "left", "top", "scaleX", "scaleY", "angle", "flipX", "flipY")
+    }
+    payload = json.dumps([geometry, [line.get("path") for line in drawn_lines]], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
 # 세션 상태를 사용하여 마지막으로 선택된 도형과 크기를 추적합니다.
 if 'last_selected_shape' not in st.session_state:
     st.session_state.last_selected_shape = selected_shape_type
     st.session_state.last_selected_size = selected_tile_size
     st.session_state.initial_canvas_data = get_cached_initial_drawing_data(selected_shape_type, selected_tile_size, canvas_width, canvas_height)
+    st.session_state.canvas_revision = 0
+    st.session_state.last_canvas_objects = None
+    st.session_state.last_drawing_mode = None
 elif (st.session_state.last_selected_shape != selected_shape_type or
       st.session_state.last_selected_size != selected_tile_size):
     st.session_state.initial_canvas_data = get_cached_initial_drawing_data(selected_shape_type, selected_tile_size, canvas_width, canvas_height)
     st.session_state.last_selected_shape = selected_shape_type
     st.session_state.last_selected_size = selected_tile_size
+    # 도형/크기가 바뀔 때만 캔버스를 새로 만듭니다.
+    st.session_state.canvas_revision += 1
+    st.session_state.last_canvas_objects = None
     # 선택이 바뀌면 "도형 확정" 상태도 리셋
-    if 'confirmed_polygon_vertices' in st.session_state:
-        del st.session_state['confirmed_polygon_vertices']
-    if 'canvas_drawn_objects' in st.session_state:
-        del st.session_state['canvas_drawn_objects']
+    for state_key in ('confirmed_polygon_vertices', 'canvas_drawn_objects', 'confirmed_geometry_hash'):
+        if state_key in st.session_state:
+            del st.session_state[state_key]
 
 
 # --- 메인 섹션: 2. 캔버스에서 도형 변형 및 꾸미기 ---
@@ -105,36 +141,49 @@ drawing_mode_select = st.radio(
 )
 current_drawing_mode = "transform" if drawing_mode_select == "도형 변형 (Transform)" else "freedraw"
 
+# 모드가 바뀌면 지금까지 편집한 캔버스 내용을 초기 데이터로 저장해 둡니다.
+# (컴포넌트가 다시 그려지더라도 편집한 타일이 사라지지 않습니다.)
+if (st.session_state.last_drawing_mode is not None and
+        st.session_state.last_drawing_mode != current_drawing_mode and
+        st.session_state.last_canvas_objects is not None):
+    st.session_state.initial_canvas_data = {"objects": st.session_state.last_canvas_objects}
+st.session_state.last_drawing_mode = current_drawing_mode
+
 # 캔버스 컴포넌트 렌더링
-canvas_result = st_canvas(
-    fill_color="rgba(255, 165, 0, 0.3)" if current_drawing_mode == "freedraw" else "rgba(0,0,0,0)", # 그리기 모드일 때 채우기 색상
-    stroke_width=stroke_width,
-    stroke_color=stroke_color,
-    background_color=background_color,
-    height=canvas_height,
-    width=canvas_width,
-    drawing_mode=current_drawing_mode, # 선택된 그리기 모드 적용
-    initial_drawing=st.session_state.initial_canvas_data, # 세션 상태에서 초기 데이터 로드
-    key=f"drawable_canvas_{selected_shape_type}_{selected_tile_size}_{current_drawing_mode}" # key를 동적으로 변경하여 강제 리렌더링
-)
+with metrics.section("canvas"):
+    st_canvas = lazy_import("streamlit_drawable_canvas").st_canvas
+    canvas_result = st_canvas(
+        fill_color="rgba(255, 165, 0, 0.3)" if current_drawing_mode == "freedraw" else "rgba(0,0,0,0)", # 그리기 모드일 때 채우기 색상
+        stroke_width=stroke_width,
+        stroke_color=stroke_color,
+        background_color=background_color,
+        height=canvas_height,
+        width=canvas_width,
+        drawing_mode=current_drawing_mode, # 선택된 그리기 모드 적용
+        initial_drawing=st.session_state.initial_canvas_data, # 세션 상태에서 초기 데이터 로드
+        key=f"drawable_canvas_{st.session_state.canvas_revision}" # 도형/크기 변경 시에만 바뀌는 고정 key
+    )
+
+canvas_objects = None
+if canvas_result.json_data is not None and "objects" in canvas_result.json_data:
+    canvas_objects = canvas_result.json_data["objects"]
+    st.session_state.last_canvas_objects = canvas_objects
 
 # --- 도형 확정 버튼 ---
 if st.button("캔버스 도형 확정 (테셀레이션 시작)", key="confirm_shape_button"):
-    if canvas_result.json_data is not None and "objects" in canvas_result.json_data:
-        # 마지막으로 그려지거나 변형된 객체 (가장 최근에 상호작용한 객체)
-        # 여러 객체가 있을 수 있으므로 polygon 타입의 객체를 찾습니다.
-        polygon_object = None
-        for obj in reversed(canvas_result.json_data["objects"]):
-            if obj.get("type") == "polygon":
-                polygon_object = obj
-                break
-        
+    if canvas_objects is not None:
+        polygon_object = find_tile_object(canvas_objects)
+
         # 자유 그리기로 그린 선들도 함께 저장 (꾸미기 정보)
-        drawn_lines = [obj for obj in canvas_result.json_data["objects"] if obj.get("type") == "path" or obj.get("type") == "line"]
+        drawn_lines = get_drawn_lines(canvas_objects)
 
         if polygon_object and "points" in polygon_object:
-            st.session_state.confirmed_polygon_vertices = np.array(polygon_object["points"])
-            st.session_state.canvas_drawn_objects = drawn_lines # 꾸민 선들 저장
+            geometry_hash = get_geometry_hash(polygon_object, drawn_lines)
+            # 이미 같은 도형이 확정되어 있으면 다시 저장하지 않습니다.
+            if st.session_state.get('confirmed_geometry_hash') != geometry_hash:
+                st.session_state.confirmed_polygon_vertices = np.array(polygon_object["points"])
+                st.session_state.canvas_drawn_objects = drawn_lines # 꾸민 선들 저장
+                st.session_state.confirmed_geometry_hash = geometry_hash
             st.success("도형이 성공적으로 확정되었습니다! 사이드바에서 테셀레이션 설정을 진행하세요.")
         else:
             st.error("캔버스에서 유효한 도형을 찾을 수 없습니다. 도형을 변형하거나 그려주세요.")
@@ -180,6 +229,9 @@ if 'confirmed_polygon_vertices' in st.session_state and st.session_state.confirm
         if vertices is None or len(vertices) == 0:
             return None
 
+        plt = lazy_import("matplotlib.pyplot")
+        Polygon = lazy_import("matplotlib.patches").Polygon
+
         # 변형된 도형의 경계 상자 계산 (Matplotlib에 그릴 때 사용할 기준)
         min_x, min_y = np.min(vertices[:, 0]), np.min(vertices[:, 1])
         max_x, max_y = np.max(vertices[:, 0]), np.max(vertices[:, 1])
@@ -278,19 +330,35 @@ if 'confirmed_polygon_vertices' in st.session_state and st.session_state.confirm
 
         return fig
 
+    # --- 테셀레이션 이미지 캐싱 ---
+    # 도형은 geometry_hash로만 구분하고(_로 시작하는 인자는 해시하지 않음),
+    # 도형과 설정이 그대로인 재실행에서는 Matplotlib 렌더링을 건너뜁니다.
+    # 화면용 PNG는 st.pyplot과 같은 dpi=200으로, 다운로드용 PNG는 기존과 같은 기본 dpi로 저장합니다.
+    @metrics.cache_data(show_spinner=False, max_entries=32)
+    def render_tessellation_png(geometry_hash, _vertices, ref_tile_size, rows, cols, color1, color2, transform_type, rotation_angle, current_shape_type, _drawn_objects_data):
+        fig = create_tessellation_pattern(_vertices, ref_tile_size, rows, cols, color1, color2, transform_type, rotation_angle, current_shape_type, _drawn_objects_data)
+        if fig is None:
+            return None, None
+        display_buf = BytesIO()
+        fig.savefig(display_buf, format="png", dpi=200, bbox_inches='tight')
+        download_buf = BytesIO()
+        fig.savefig(download_buf, format="png", bbox_inches='tight', pad_inches=0.1)
+        lazy_import("matplotlib.pyplot").close(fig)
+        return display_buf.getvalue(), download_buf.getvalue()
+
     # --- 메인 화면에 테셀레이션 패턴 표시 ---
     st.subheader("생성된 테셀레이션 패턴")
-    fig = create_tessellation_pattern(final_base_vertices, selected_tile_size, rows, cols, color1, color2, transform_type, rotation_angle, selected_shape_type, canvas_drawn_objects)
-    if fig:
-        st.pyplot(fig)
-        buf = BytesIO()
-        fig.savefig(buf, format="png", bbox_inches='tight', pad_inches=0.1)
-        st.download_button(
-            label="테셀레이션 이미지 다운로드 (PNG)",
-            data=buf.getvalue(),
-            file_name="custom_tessellation.png",
-            mime="image/png"
-        )
+    with metrics.section("compute"):
+        display_png, download_png = render_tessellation_png(st.session_state.confirmed_geometry_hash, final_base_vertices, selected_tile_size, rows, cols, color1, color2, transform_type, rotation_angle, selected_shape_type, canvas_drawn_objects)
+    if display_png:
+        with metrics.section("render"):
+            st.image(display_png, width="stretch")
+            st.download_button(
+                label="테셀레이션 이미지 다운로드 (PNG)",
+                data=download_png,
+                file_name="custom_tessellation.png",
+                mime="image/png"
+            )
     else:
         st.warning("테셀레이션 패턴을 생성할 수 없습니다. 도형 확정을 눌렀는지 확인해 보세요.")
 else:
@@ -298,3 +366,5 @@ else:
 
 st.markdown("---")
 st.info("이 도구는 Python의 Streamlit과 Matplotlib, 그리고 streamlit-drawable-canvas를 사용하여 만들어졌습니다.")
+
+metrics.dev_panel()
@@ -0,0 +1 @@
+"""Helpers shared by ``main.py`` and the pages under ``pages/``."""
@@ -0,0 +1,121 @@
+"""Compact Plotly figure emission shared by the chart pages.
+
+``plotly_chart`` is a drop-in for ``st.plotly_chart`` that first passes the
+figure through ``compact_figure``. It rewrites long x/y trace arrays as
+base64 typed arrays (``{"dtype", "bdata"}``):
+
+- floats are downcast to float32 when the values stay within ``FLOAT32_RTOL``
+- integers use the narrowest typed-array integer type that fits
+- datetimes are sent as epoch milliseconds, and their axis is set to ``date``
+
+Layout is left untouched on purpose. Stripping "default" axis settings such
+as ``showgrid`` and ``zeroline`` was tried and dropped, because Streamlit's
+plotly theme overrides those defaults and the explicit values are needed.
+"""
+import base64
+
+import numpy as np
+import streamlit as st
+
+# 이보다 짧은 배열(점근선 두 점 등)은 인코딩 이득이 없으므로 그대로 둡니다.
+MIN_BINARY_LENGTH = 16
+# float32로 줄여도 되는 상대 오차 한계 (최댓값의 1e-9보다 작은 값은 그래프에 보이지 않으므로 무시)
+FLOAT32_RTOL = 1e-6
+FLOAT32_ATOL_SCALE = 1e-9
+# plotly.js typed array가 지원하는 정수형 (작은 것부터)
+INTEGER_DTYPES = ("i1", "u1", "i2", "u2", "i4", "u4")
+TRACE_ARRAY_ATTRS = ("x", "y")
+
+
+def _typed_array_spec(array):
+    array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+    return {"dtype": array.dtype.str[1:], "bdata": base64.b64encode(array.tobytes()).decode("ascii")}
+
+
+def _narrow_integers(array):
+    if array.size == 0:
+        return array.astype("i1")
+    low, high = array.min(), array.max()
+    for dtype in INTEGER_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return array.astype(dtype)
+    return array.astype("f8")
+
+
+def _narrow_floats(array):
+    array = array.astype("f8", copy=False)
+    finite = np.abs(array[np.isfinite(array)])
+    if finite.size and finite.max() > np.finfo("f4").max:
+        return array
+    narrowed = array.astype("f4")
+    atol = FLOAT32_ATOL_SCALE * finite.max() if finite.size else 0.0
+    if np.allclose(narrowed, array, rtol=FLOAT32_RTOL, atol=atol, equal_nan=True):
+        return narrowed
+    return array
+
+
+def _datetimes_to_epoch_ms(array):
+    if array.dtype.kind == "O":
+        if not hasattr(array[0], "isoformat"):
+            return None
+        try:
+            array = array.astype("datetime64[ms]")
+        except (TypeError, ValueError):
+            return None
+    milliseconds = array.astype("datetime64[ms]")
+    epoch_ms = milliseconds.astype("i8").astype("f8")
+    epoch_ms[np.isnat(milliseconds)] = np.nan
+    return epoch_ms
+
+
+def _encode_array(value):
+    """Return ``(typed_array_spec, is_date)`` for ``value``, or ``None`` to leave it as is."""
+    if value is None or isinstance(value, (str, dict)):
+        return None
+    array = np.asarray(value)
+    if array.ndim != 1 or array.size < MIN_BINARY_LENGTH:
+        return None
+
+    is_date = False
+    if array.dtype.kind in "MO":
+        array = _datetimes_to_epoch_ms(array)
+        if array is None:
+            return None
+        is_date = True
+    elif array.dtype.kind in "iu":
+        array = _narrow_integers(array)
+    elif array.dtype.kind == "f":
+        array = _narrow_floats(array)
+    elif array.dtype.kind == "b":
+        array = array.astype("u1")
+    else:
+        return None
+
+    return _typed_array_spec(array), is_date
+
+
+def compact_figure(fig):
+    """Rewrite ``fig`` in place for a smaller, faster-to-encode payload and return it."""
+    date_axes = set()
+    for trace in fig.data:
+        for attr in TRACE_ARRAY_ATTRS:
+            if attr not in trace:
+                continue
+            encoded = _encode_array(trace[attr])
+            if encoded is None:
+                continue
+            spec, is_date = encoded
+            trace[attr] = spec
+            if is_date:
+                axis_ref = trace[f"{attr}axis"] or attr
+                date_axes.add(f"{attr}axis{axis_ref[1:]}")
+    for axis_name in date_axes:
+        if fig.layout[axis_name].type is None:
+            fig.layout[axis_name].type = "date"
+    return fig
+
+
+def plotly_chart(fig, **kwargs):
+    """``st.plotly_chart`` that sends ``fig`` through ``compact_figure`` first."""
+    return st.plotly_chart(compact_figure(fig), **kwargs)
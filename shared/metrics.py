@@ -0,0 +1,334 @@
+"""Per-rerun timing, cache and memory metrics shared by all pages.
+
+A page calls ``start_rerun("<page>")`` near the top and wraps the parts it
+wants timed in ``section("fetch")``, ``section("compute")`` and so on, as a
+context manager, a decorator or flat ``start()``/``stop()`` calls. ``cache_data`` is ``st.cache_data``
+plus hit/miss counting. Everything is kept in one process-wide registry:
+
+- rerun counts and sessions seen per page
+- latency histograms per page and section
+- cache hits and misses per cached function
+- the largest resident-memory growth within a single rerun of each page
+
+Per-session numbers (reruns and memory growth on each page) live in
+``st.session_state`` so they go away with the session. Memory is sampled
+from ``/proc/self/statm`` at ``start_rerun``, at the end of every section and
+in ``dev_panel``. Elsewhere (macOS, Windows) memory is not recorded.
+Streamlit serves all sessions from one process, so a concurrent session's
+allocations can show up in another rerun's growth.
+
+``dev_panel()`` shows the numbers in a sidebar expander when the page is
+opened with ``?dev=1`` or the server runs with ``DEV_PANEL=1``. The registry
+is also written as Prometheus text to ``METRICS_PATH`` (default
+``metrics/app_metrics.prom``) at most every ``EXPORT_INTERVAL`` seconds.
+"""
+import contextlib
+import functools
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import streamlit as st
+
+METRICS_PATH = Path(os.environ.get("METRICS_PATH", Path(__file__).resolve().parent.parent / "metrics" / "app_metrics.prom"))
+EXPORT_INTERVAL = 5.0
+# 구간 지연 히스토그램 경계 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_PAGE_KEY = "_metrics_page"
+_SESSION_RERUNS_KEY = "_metrics_session_reruns"
+_SESSION_MEMORY_KEY = "_metrics_session_memory"
+_RSS_START_KEY = "_metrics_rss_start"
+_RSS_MAX_KEY = "_metrics_rss_max"
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield bound, total
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.page_reruns = defaultdict(int)
+        self.page_sessions = defaultdict(int)  # page -> 이 페이지를 연 세션 수 (누적)
+        self.sections = defaultdict(Histogram)  # (page, section) -> Histogram
+        self.cache = defaultdict(lambda: {"hit": 0, "miss": 0})
+        self.rerun_memory = {}  # page -> 재실행 한 번의 최대 메모리 증가량 (바이트)
+        self.last_export = 0.0
+
+
+_registry = Registry()
+
+
+def _current_page():
+    return st.session_state.get(_PAGE_KEY, "unknown")
+
+
+def _current_rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _sample_rss():
+    rss = _current_rss_bytes()
+    if rss is not None and _RSS_START_KEY in st.session_state:
+        st.session_state[_RSS_MAX_KEY] = max(st.session_state.get(_RSS_MAX_KEY, 0), rss)
+
+
+def _finish_rerun_memory(page):
+    # start_rerun 이후 이번 재실행에서 관찰된 최대 RSS 증가량을 기록합니다.
+    _sample_rss()
+    start = st.session_state.pop(_RSS_START_KEY, None)
+    peak = st.session_state.pop(_RSS_MAX_KEY, None)
+    if start is None or peak is None:
+        return
+    growth = max(peak - start, 0)
+    session_memory = st.session_state.setdefault(_SESSION_MEMORY_KEY, {})
+    session_memory[page] = max(session_memory.get(page, 0), growth)
+    with _registry.lock:
+        _registry.rerun_memory[page] = max(_registry.rerun_memory.get(page, 0), growth)
+
+
+def start_rerun(page):
+    """Count a rerun of ``page`` for this session and make it the current page."""
+    st.session_state[_PAGE_KEY] = page
+    session_reruns = st.session_state.setdefault(_SESSION_RERUNS_KEY, {})
+    first_visit = page not in session_reruns
+    session_reruns[page] = session_reruns.get(page, 0) + 1
+    with _registry.lock:
+        _registry.page_reruns[page] += 1
+        if first_visit:
+            _registry.page_sessions[page] += 1
+
+    rss = _current_rss_bytes()
+    if rss is not None:
+        st.session_state[_RSS_START_KEY] = rss
+        st.session_state[_RSS_MAX_KEY] = rss
+    _maybe_export()
+
+
+class section(contextlib.ContextDecorator):
+    """Time a named section of the current page.
+
+    Use it as a ``with`` block, as a decorator, or flat with
+    ``timer = section("compute").start()`` ... ``timer.stop()``.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def _recreate_cm(self):
+        # 데코레이터로 쓸 때 호출마다 새 인스턴스를 만들어 시작 시각이 섞이지 않게 합니다.
+        return section(self.name)
+
+    def start(self):
+        self._start = time.perf_counter()
+        return self
+
+    def stop(self):
+        elapsed = time.perf_counter() - self._start
+        with _registry.lock:
+            _registry.sections[(_current_page(), self.name)].observe(elapsed)
+        _sample_rss()
+        return elapsed
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+def record_cache(name, hit):
+    with _registry.lock:
+        _registry.cache[name]["hit" if hit else "miss"] += 1
+
+
+def cache_data(name=None, **cache_kwargs):
+    """``st.cache_data`` that also counts hits and misses under ``name``.
+
+    The wrapped function only runs on a miss, so a flag set inside it tells
+    the two apart. ``_``-prefixed arguments are still excluded from hashing.
+    Like ``st.cache_data`` it works bare (``@cache_data``) or called.
+    """
+    def decorator(func):
+        cache_name = name or func.__name__
+        state = threading.local()
+
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            state.missed = True
+            return func(*args, **kwargs)
+
+        cached = st.cache_data(**cache_kwargs)(compute)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            state.missed = False
+            result = cached(*args, **kwargs)
+            record_cache(cache_name, hit=not state.missed)
+            return result
+
+        wrapper.clear = cached.clear
+        return wrapper
+
+    if callable(name):
+        func, name = name, None
+        return decorator(func)
+    return decorator
+
+
+# --- Prometheus 텍스트 내보내기 ---
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus():
+    """Return the registry in the Prometheus text exposition format."""
+    lines = []
+    with _registry.lock:
+        lines += [
+            "# HELP app_reruns_total Script reruns per page.",
+            "# TYPE app_reruns_total counter",
+        ]
+        for page, count in sorted(_registry.page_reruns.items()):
+            lines.append(f'app_reruns_total{{page="{_label(page)}"}} {count}')
+
+        lines += [
+            "# HELP app_sessions_total Sessions that have opened each page.",
+            "# TYPE app_sessions_total counter",
+        ]
+        for page, count in sorted(_registry.page_sessions.items()):
+            lines.append(f'app_sessions_total{{page="{_label(page)}"}} {count}')
+
+        lines += [
+            "# HELP app_section_seconds Latency of named page sections.",
+            "# TYPE app_section_seconds histogram",
+        ]
+        for (page, name), hist in sorted(_registry.sections.items()):
+            labels = f'page="{_label(page)}",section="{_label(name)}"'
+            for bound, total in hist.cumulative():
+                lines.append(f'app_section_seconds_bucket{{{labels},le="{bound}"}} {total}')
+            lines.append(f'app_section_seconds_bucket{{{labels},le="+Inf"}} {hist.count}')
+            lines.append(f"app_section_seconds_sum{{{labels}}} {hist.sum}")
+            lines.append(f"app_section_seconds_count{{{labels}}} {hist.count}")
+
+        lines += [
+            "# HELP app_cache_requests_total Cached function calls by result.",
+            "# TYPE app_cache_requests_total counter",
+        ]
+        for name, counts in sorted(_registry.cache.items()):
+            for result in ("hit", "miss"):
+                lines.append(f'app_cache_requests_total{{cache="{_label(name)}",result="{result}"}} {counts[result]}')
+
+        lines += [
+            "# HELP app_rerun_memory_growth_bytes Largest resident-memory growth within a single rerun of each page.",
+            "# TYPE app_rerun_memory_growth_bytes gauge",
+        ]
+        for page, growth in sorted(_registry.rerun_memory.items()):
+            lines.append(f'app_rerun_memory_growth_bytes{{page="{_label(page)}"}} {growth}')
+    return "\n".join(lines) + "\n"
+
+
+def export(path=None):
+    """Write the Prometheus text to ``path`` (default ``METRICS_PATH``)."""
+    path = Path(path or METRICS_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(to_prometheus(), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
+
+
+def _maybe_export():
+    now = time.monotonic()
+    with _registry.lock:
+        if now - _registry.last_export < EXPORT_INTERVAL:
+            return
+        _registry.last_export = now
+    try:
+        export()
+    except OSError as e:
+        st.session_state.setdefault("_metrics_export_error", str(e))
+
+
+# --- 개발자 패널 ---
+def dev_panel_enabled():
+    return os.environ.get("DEV_PANEL") == "1" or st.query_params.get("dev") == "1"
+
+
+def dev_panel():
+    """Show this page's metrics in a sidebar expander when the panel is enabled."""
+    page = _current_page()
+    _finish_rerun_memory(page)
+    _maybe_export()
+    if not dev_panel_enabled():
+        return
+
+    with _registry.lock:
+        page_reruns = _registry.page_reruns[page]
+        section_rows = [
+            {
+                "구간": name,
+                "횟수": hist.count,
+                "평균 (ms)": f"{hist.sum / hist.count * 1000:.1f}",
+                "최대 (ms)": f"{hist.max * 1000:.1f}",
+            }
+            for (section_page, name), hist in sorted(_registry.sections.items())
+            if section_page == page and hist.count
+        ]
+        cache_rows = [
+            {
+                "캐시": name,
+                "적중": counts["hit"],
+                "미적중": counts["miss"],
+                "적중률": f"{counts['hit'] / (counts['hit'] + counts['miss']):.0%}",
+            }
+            for name, counts in sorted(_registry.cache.items())
+            if counts["hit"] + counts["miss"]
+        ]
+        page_memory = _registry.rerun_memory.get(page)
+    session_reruns = st.session_state.get(_SESSION_RERUNS_KEY, {}).get(page, 0)
+    session_memory = st.session_state.get(_SESSION_MEMORY_KEY, {}).get(page)
+
+    with st.sidebar.expander("🛠️ 개발자 패널"):
+        st.write(f"페이지 재실행: 전체 {page_reruns}회 / 이 세션 {session_reruns}회")
+        if page_memory is not None:
+            st.write(
+                f"재실행 중 최대 메모리 증가: 전체 {page_memory / 1024 ** 2:.1f} MB"
+                f" / 이 세션 {(session_memory or 0) / 1024 ** 2:.1f} MB"
+            )
+        if section_rows:
+            st.table(section_rows)
+        if cache_rows:
+            st.table(cache_rows)
+        st.caption(f"Prometheus 파일: {METRICS_PATH}")
+        if "_metrics_export_error" in st.session_state:
+            st.caption(f"내보내기 실패: {st.session_state['_metrics_export_error']}")
@@ -0,0 +1,88 @@
+"""Startup helpers: deferred heavy imports, background warm-up and import timing.
+
+Pages paint their title and sidebar first and only then call ``lazy_import``
+for the heavy libraries a code path actually needs. ``warm_up`` imports those
+libraries once per server process in a background thread, so by the time a
+page asks for them they are usually already loaded. Set the environment
+variable ``WARM_START=0`` to turn the warm-up off.
+
+plotly is not deferred: ``import streamlit`` already loads it, so pages
+import ``plotly.graph_objects`` at the top as usual. Modules that were
+already loaded before their first ``lazy_import`` are reported as
+``"already loaded"`` rather than with a misleading near-zero cost.
+"""
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 페이지에서 사용하는 무거운 모듈 (가져오는 데 오래 걸리는 순서대로)
+# plotly는 streamlit을 import할 때 이미 불러오므로 넣지 않습니다.
+HEAVY_MODULES = (
+    "pandas",
+    "scipy.stats",
+    "matplotlib.pyplot",
+    "yfinance",
+    "streamlit_drawable_canvas",
+)
+
+_import_times = {}
+_lock = threading.Lock()
+_warm_up_thread = None
+
+
+def lazy_import(name, source="page"):
+    """Import ``name`` on first use and record how long the first import took.
+
+    If the warm-up thread is importing the same module, this waits for it to
+    finish instead of importing it twice.
+    """
+    existing = sys.modules.get(name)
+    # 다른 스레드가 아직 불러오는 중인 모듈은 이미 불러온 것으로 치지 않습니다.
+    if existing is not None and not getattr(getattr(existing, "__spec__", None), "_initializing", False):
+        source = "already loaded"
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    elapsed = time.perf_counter() - start
+    with _lock:
+        if name not in _import_times:
+            _import_times[name] = {"seconds": elapsed, "source": source}
+            logger.info("imported %s in %.3fs (%s)", name, elapsed, source)
+    return module
+
+
+def _warm_up_modules(modules):
+    for name in modules:
+        try:
+            lazy_import(name, source="warm-up")
+        except Exception:
+            logger.exception("warm-up import of %s failed", name)
+
+
+def warm_up(modules=HEAVY_MODULES):
+    """Start importing ``modules`` in a background thread, once per process."""
+    global _warm_up_thread
+    if os.environ.get("WARM_START", "1") == "0":
+        return None
+    with _lock:
+        if _warm_up_thread is None:
+            _warm_up_thread = threading.Thread(
+                target=_warm_up_modules, args=(tuple(modules),), name="warm-up", daemon=True
+            )
+            _warm_up_thread.start()
+    return _warm_up_thread
+
+
+def import_report():
+    """Return the recorded first-import cost per module, slowest first."""
+    with _lock:
+        items = list(_import_times.items())
+    return sorted(
+        ({"module": name, **info} for name, info in items),
+        key=lambda row: row["seconds"],
+        reverse=True,
+    )